@@ -1,11 +1,17 @@
 """Accounts Auth"""
 
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from threading import Lock
 from typing import Optional
 
+from cachetools import TTLCache
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHashError
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Header
 from tortoise.exceptions import OperationalError
 
@@ -17,44 +23,82 @@ SECRET_KEY = settings.API_AUTHORIZATION_TOKEN
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 70
+ACCESS_EXP_SECONDS = ACCESS_TOKEN_EXPIRE_DAYS * 86400
+REFRESH_EXP_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 86400
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Direct argon2-cffi hasher (native argon2 implementation). Hashes stay in the
+# standard PHC string format, so existing passlib-generated hashes still verify.
+password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
 # --- Password Utils ---
 def hash_password(password: str) -> str:
     """Hash a password using Argon2."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerifyMismatchError, VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses outdated Argon2 parameters."""
+    try:
+        return password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
 
 
 # --- JWT Utils ---
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-    )
+    # Numeric epoch exp claim (RFC 7519 NumericDate); skips two datetime
+    # allocations per token compared to datetime arithmetic
+    if expires_delta is not None:
+        expire = int(time.time() + expires_delta.total_seconds())
+    else:
+        expire = int(time.time()) + ACCESS_EXP_SECONDS
     to_encode.update({"exp": expire, "scope": "access_token"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token."""
-    expire = datetime.now(timezone.utc) + \
-        timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = int(time.time()) + REFRESH_EXP_SECONDS
     to_encode = {**data, "exp": expire, "scope": "refresh_token"}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Short-lived cache of verified token payloads so repeated requests from the
+# same client skip the HMAC verification. Keyed by the token's SHA-256 digest,
+# never by the raw token. Set JWT_CACHE_TTL=0 to disable (e.g. in tests).
+_token_cache: TTLCache = TTLCache(
+    maxsize=10_000, ttl=max(settings.JWT_CACHE_TTL, 1))
+_token_cache_lock = Lock()
+
+
 def decode_token(token: str) -> dict:
     """Decode a JWT and validate its signature."""
+    cache_enabled = settings.JWT_CACHE_TTL > 0
+    if cache_enabled:
+        cache_key = hashlib.sha256(token.encode()).digest()
+        with _token_cache_lock:
+            payload = _token_cache.get(cache_key)
+        # Respect the token's own expiry even while cached
+        if payload is not None and payload.get("exp", 0) > time.time():
+            return payload
+
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,6 +106,11 @@ def decode_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if cache_enabled:
+        with _token_cache_lock:
+            _token_cache[cache_key] = payload
+    return payload
+
 
 def decode_refresh_token(token: str) -> dict:
     """Decode a JWT refresh token and validate its signature and scope."""
@@ -75,8 +124,33 @@ def decode_refresh_token(token: str) -> dict:
     return payload
 
 
+# Short-lived cache of authenticated users so hot users skip the per-request
+# DB round-trip. Staleness window: profile/role/status changes (including
+# suspend/deactivate) can take up to USER_CACHE_TTL seconds to be observed by
+# in-flight sessions. Mutating endpoints call invalidate_user_cache().
+USER_CACHE_TTL = 10
+_user_cache: TTLCache = TTLCache(maxsize=20_000, ttl=USER_CACHE_TTL)
+
+
+def invalidate_user_cache(user_id) -> None:
+    """Drop a user from the auth cache after a mutation."""
+    _user_cache.pop(str(user_id), None)
+
+
+# The active-token population is small, so memoizing the string -> UUID parse
+# skips the Python-level UUID parsing on every authenticated request.
+_parse_user_id = lru_cache(maxsize=10_000)(uuid.UUID)
+
+
+# Columns needed purely for authorization decisions; endpoints that never
+# mutate or fully serialize the account can use the lite dependency below.
+AUTH_ONLY_FIELDS = ("id", "role", "status", "email")
+
+
 # --- User retrieval ---
-async def get_user_from_token(token: str) -> Optional[Account]:
+async def get_user_from_token(
+    token: str, only: Optional[tuple] = None, with_image: bool = False
+) -> Optional[Account]:
     """Retrieve a user object from a JWT token with DB error handling."""
     payload = decode_token(token)
     if payload.get("scope") != "access_token":
@@ -87,13 +161,26 @@ async def get_user_from_token(token: str) -> Optional[Account]:
         raise HTTPException(status_code=401, detail="Missing user ID in token")
 
     try:
-        user_uuid = uuid.UUID(user_id)
+        user_uuid = _parse_user_id(user_id)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid user ID format")
 
+    if not with_image:
+        cached = _user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
     # DB access wrapped with error handling
     try:
-        user = await Account.filter(id=user_uuid).first()
+        query = Account.filter(id=user_uuid)
+        if with_image:
+            # Single JOIN instead of a follow-up fetch_related round-trip
+            user = await query.select_related("image").first()
+        elif only:
+            # Slim projection: skips the password hash and profile columns
+            user = await query.only(*only).first()
+        else:
+            user = await query.first()
     except OperationalError:
         raise HTTPException(
             status_code=500, detail="Database connection error")
@@ -103,9 +190,24 @@ async def get_user_from_token(token: str) -> Optional[Account]:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # Only cache the plain full fetch, never projections or joined variants
+    if not only and not with_image:
+        _user_cache[user_id] = user
     return user
 
 
+def _extract_bearer(authorization: str) -> Optional[str]:
+    """Extract the token from a `JWT <token>` or `Bearer <token>` header.
+    Prefix slicing avoids the list allocation of `.split()` on the hot path.
+    """
+    if authorization[:4] == "JWT ":
+        return authorization[4:] or None
+    if authorization[:7] == "Bearer ":
+        token = authorization[7:]
+        return token if token and " " not in token else None
+    return None
+
+
 # --- Current user dependency ---
 async def get_current_user(authorization: Optional[str] = Header(None)) -> Account:
     """Resolve current user from Authorization header.
@@ -115,14 +217,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> Accou
         raise HTTPException(
             status_code=401, detail="Missing authorization header")
 
-    token: Optional[str] = None
-    if authorization.startswith("JWT "):
-        token = authorization[4:]
-    elif authorization.startswith("Bearer "):
-        parts = authorization.split()
-        if len(parts) == 2:
-            token = parts[1]
-
+    token = _extract_bearer(authorization)
     if not token:
         raise HTTPException(
             status_code=401, detail="Invalid authorization scheme")
@@ -130,6 +225,38 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> Accou
     return await get_user_from_token(token)
 
 
+async def get_current_user_with_image(authorization: Optional[str] = Header(None)) -> Account:
+    """Resolve current user with the image relation eagerly joined.
+    Use in endpoints that serialize the profile, so no second query is needed.
+    """
+    if not authorization:
+        raise HTTPException(
+            status_code=401, detail="Missing authorization header")
+
+    token = _extract_bearer(authorization)
+    if not token:
+        raise HTTPException(
+            status_code=401, detail="Invalid authorization scheme")
+
+    return await get_user_from_token(token, with_image=True)
+
+
+async def get_current_user_lite(authorization: Optional[str] = Header(None)) -> Account:
+    """Resolve current user loading only the columns auth needs.
+    Use in read-only endpoints that never save or fully serialize the account.
+    """
+    if not authorization:
+        raise HTTPException(
+            status_code=401, detail="Missing authorization header")
+
+    token = _extract_bearer(authorization)
+    if not token:
+        raise HTTPException(
+            status_code=401, detail="Invalid authorization scheme")
+
+    return await get_user_from_token(token, only=AUTH_ONLY_FIELDS)
+
+
 async def get_current_user_optional(authorization: Optional[str] = Header(None)) -> Optional[Account]:
     """Resolve current user from Authorization header, returns None if not authenticated.
     Supports `JWT <token>` and falls back to `Bearer <token>` for tooling.
@@ -137,14 +264,7 @@ async def get_current_user_optional(authorization: Optional[str] = Header(None))
     if not authorization:
         return None
 
-    token: Optional[str] = None
-    if authorization.startswith("JWT "):
-        token = authorization[4:]
-    elif authorization.startswith("Bearer "):
-        parts = authorization.split()
-        if len(parts) == 2:
-            token = parts[1]
-
+    token = _extract_bearer(authorization)
     if not token:
         return None
 
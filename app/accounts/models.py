@@ -41,6 +41,8 @@ class Account(models.Model):
             ("role",),
             ("status",),
             ("role", "status"),
+            # Serves the list_users filter + sort in one index scan
+            ("status", "first_name", "last_name"),
         ]
 
     def __str__(self):
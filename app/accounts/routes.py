@@ -6,12 +6,13 @@ from typing import Optional
 from fastapi import (APIRouter, BackgroundTasks, File,
                      UploadFile, status, HTTPException, Depends, Response, Query)
 from fastapi.security import HTTPBearer
+from pydantic import TypeAdapter
+from tortoise.exceptions import IntegrityError
 from tortoise.expressions import Q
 
 from app.accounts.enums import UserStatus, UserRole
 from app.accounts.models import Account
 from app.accounts.schemas import (
-    AccountFullPydantic,
     AccountCreatePydantic,
     AccountRead,
     LoginUserSchema,
@@ -29,21 +30,29 @@ from app.accounts.auth import (
     verify_password,
     create_access_token,
     create_refresh_token,
-    get_current_user
+    get_current_user,
+    get_current_user_lite,
+    get_current_user_with_image,
+    invalidate_user_cache,
+    password_needs_rehash,
 )
 
 from app.base.models import FileAsset
 from app.config.settings import settings
-from app.config.storage import r2_storage
+from app.config.storage import get_r2
 
 
 router = APIRouter(prefix="/auth", tags=["Accounts"])
 security = HTTPBearer()
 
+# Shared list adapter so paginated pages validate through one
+# pydantic-core loop instead of a per-row model_validate call
+_account_read_list = TypeAdapter(list[AccountRead])
+
 
 async def get_user_or_404_by_email(email: str) -> Account:
     """Fetch Account by email field or 404."""
-    user = await Account.filter(email=email).first()
+    user = await Account.filter(email=email).select_related("image").first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
     return user
@@ -59,10 +68,23 @@ async def login_user(response: Response, data: LoginUserSchema):
         if user.status == UserStatus.DEACTIVATED:
             raise HTTPException(status_code=403, detail="User is deactivated.")
         raise HTTPException(status_code=400, detail="User is not active.")
+    # Reject junk before paying the Argon2 CPU cost; real candidates still
+    # get the constant-time verify below
+    if not data.password or len(data.password) > 1024:
+        raise HTTPException(
+            status_code=400, detail="Incorrect email or password.")
+    if not user.password.startswith("$argon2"):
+        raise HTTPException(
+            status_code=500, detail="Stored credentials are invalid.")
     if not verify_password(data.password, user.password):
         raise HTTPException(
             status_code=400, detail="Incorrect email or password.")
 
+    # Lazily migrate hashes stored with outdated Argon2 parameters,
+    # mirroring passlib's deprecated="auto" behaviour
+    if password_needs_rehash(user.password):
+        user.password = hash_password(data.password)
+
     access_token = create_access_token({"sub": str(user.id)})
     refresh_token = create_refresh_token({"sub": str(user.id)})
 
@@ -74,13 +96,13 @@ async def login_user(response: Response, data: LoginUserSchema):
         "data": {
             "access": access_token,
             "refresh": refresh_token,
-            "user": await AccountFullPydantic.from_tortoise_orm(user),
+            "user": AccountRead.model_validate(user),
         },
     }
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK, dependencies=[Depends(security)])
-async def logout_user(response: Response, current_user: Account = Depends(get_current_user)):
+async def logout_user(response: Response, current_user: Account = Depends(get_current_user_lite)):
     """Logout user; clear tokens."""
     response.delete_cookie(key="access", path=settings.AUTH_COOKIE_PATH)
     response.delete_cookie(key="refresh", path=settings.AUTH_COOKIE_PATH)
@@ -90,25 +112,28 @@ async def logout_user(response: Response, current_user: Account = Depends(get_cu
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register_user(data: AccountCreatePydantic, background_tasks: BackgroundTasks):
     """Register new user; send activation email if email provided."""
-    if data.email:
-        if await Account.filter(email=data.email).exists():
-            raise HTTPException(
-                status_code=400, detail="Email already registered.")
-
     user_data = data.model_dump(exclude_unset=True)
     user_data["password"] = hash_password(user_data["password"])
-    user = await Account.create(**user_data)
+
+    # Rely on the unique index instead of a separate exists() round-trip;
+    # this also closes the check-then-create race
+    try:
+        user = await Account.create(**user_data)
+    except IntegrityError as e:
+        if "email" in str(e).lower():
+            raise HTTPException(
+                status_code=400, detail="Email already registered.")
+        raise HTTPException(status_code=400, detail="Invalid account data.")
 
     return {
         "message": "User Created",
-        "data": await AccountFullPydantic.from_tortoise_orm(user),
+        "data": AccountRead.model_validate(user),
     }
 
 
 @router.get("/current-user", status_code=status.HTTP_200_OK, dependencies=[Depends(security)])
-async def get_current_user_data(current_user: Account = Depends(get_current_user)):
+async def get_current_user_data(current_user: Account = Depends(get_current_user_with_image)):
     """Get authenticated user's profile."""
-    await current_user.fetch_related("image")
     user_out = AccountRead.model_validate(current_user)
     return {
         "message": "User Retrieved",
@@ -128,7 +153,7 @@ async def list_users(
         None, description="Search users by first name or last name"),
     exclude_current: bool = Query(
         True, description="Exclude current user from results"),
-    current_user: Account = Depends(get_current_user)
+    current_user: Account = Depends(get_current_user_lite)
 ):
     """
     List all users with pagination.
@@ -138,9 +163,12 @@ async def list_users(
     - Optionally excludes current user from results
     - Useful for finding users to start a chat with
     """
-    # Build queryset
-    queryset = Account.filter(
-        status=UserStatus.ACTIVE).prefetch_related("image")
+    # Build queryset; project only the columns AccountRead serializes so
+    # the Argon2 password hash never crosses the wire for listings
+    queryset = Account.filter(status=UserStatus.ACTIVE).only(
+        "id", "first_name", "last_name", "role",
+        "email", "status", "created_at", "image_id",
+    ).prefetch_related("image")
 
     # Exclude current user if requested
     if exclude_current:
@@ -160,10 +188,9 @@ async def list_users(
     # Paginate
     items, meta = await PaginationHelper.paginate_queryset(queryset, pagination_params)
 
-    # Convert to AccountRead schema
-    account_reads = [
-        AccountRead.model_validate(account) for account in items
-    ]
+    # Convert to AccountRead schema in one pydantic-core pass
+    account_reads = _account_read_list.validate_python(
+        items, from_attributes=True)
 
     return PaginationHelper.create_paginated_response(account_reads, meta)
 
@@ -171,32 +198,27 @@ async def list_users(
 @router.patch("/update-user-image", status_code=status.HTTP_200_OK, dependencies=[Depends(security)])
 async def update_user_image(file: UploadFile = File(...), current_user: Account = Depends(get_current_user)):
     """Partially update authenticated user image."""
-    key = await r2_storage.upload_file(file=file, folder="user_images")
-
-    try:
-        content = await file.read()
-        file_size = len(content) if content is not None else None
-    finally:
-        await file.seek(0)
+    key = await get_r2().upload_file(file=file, folder="user_images")
 
     file = await FileAsset.create(
         key=key,
         alt_text=f"{current_user.first_name} Image",
         content_type=file.content_type,
-        file_size=file_size,
+        file_size=file.size,
     )
     current_user.image = file
     await current_user.save()
+    invalidate_user_cache(current_user.id)
     return {
         "message": "User Updated Successfully",
-        "data": await AccountFullPydantic.from_tortoise_orm(current_user),
+        "data": AccountRead.model_validate(current_user),
     }
 
 
 @router.patch("/update-profile", status_code=status.HTTP_200_OK, dependencies=[Depends(security)])
 async def update_user_profile(
     data: AccountUpdate,
-    current_user: Account = Depends(get_current_user)
+    current_user: Account = Depends(get_current_user_with_image)
 ):
     """Update authenticated user's profile."""
     update_data = data.model_dump(exclude_unset=True)
@@ -205,7 +227,7 @@ async def update_user_profile(
         setattr(current_user, key, value)
 
     await current_user.save()
-    await current_user.fetch_related("image")
+    invalidate_user_cache(current_user.id)
 
     return {
         "message": "Profile updated successfully",
@@ -224,6 +246,7 @@ async def change_password(data: ChangePasswordSchema, current_user: Account = De
             status_code=400, detail="New passwords do not match.")
     current_user.password = hash_password(data.new_password)
     await current_user.save()
+    invalidate_user_cache(current_user.id)
     return {"message": "Password changed successfully."}
 
 
@@ -240,5 +263,6 @@ if settings.ENVIRONMENT == "local":
 
         user.role = UserRole.ADMIN
         await user.save()
+        invalidate_user_cache(user.id)
 
         return {"message": f"User {email} is now an admin."}
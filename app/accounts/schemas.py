@@ -5,9 +5,10 @@ from typing import Optional
 from uuid import UUID
 
 from tortoise.contrib.pydantic import pydantic_model_creator
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 from app.accounts.models import Account
+from app.base.models import FileAsset
 from app.base.schemas import FileOut
 from app.config.pagination import PaginatedResponse
 
@@ -29,7 +30,8 @@ class AccountRead(BaseModel):
     first_name: str
     last_name: str
     role: str
-    email: str
+    # Accounts may register without an email (Account.email is nullable)
+    email: Optional[str] = None
     status: str
     created_at: datetime
     image: Optional[FileOut] = None
@@ -38,6 +40,14 @@ class AccountRead(BaseModel):
         """Pydantic model configuration"""
         from_attributes = True
 
+    @field_validator("image", mode="before")
+    @classmethod
+    def _loaded_image_or_none(cls, v):
+        """Treat Tortoise's unfetched-relation placeholders as no image."""
+        if v is None or isinstance(v, (FileAsset, FileOut, dict)):
+            return v
+        return None
+
 
 class AccountAdminDetail(AccountFullPydantic):
     """Admin detailed account view with image"""
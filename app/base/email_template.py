@@ -0,0 +1,105 @@
+"""Base HTML email template"""
+
+import time
+from datetime import datetime
+
+# The HTML shell is stored as constant segments split at the interpolation
+# points (title, body, year), so each call is three string concatenations
+# instead of re-formatting the whole multi-KB template.
+_TEMPLATE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            background-color: #f4f4f7;
+            font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
+            color: #333333;
+        }
+        .wrapper {
+            width: 100%;
+            padding: 24px 0;
+        }
+        .container {
+            max-width: 600px;
+            margin: 0 auto;
+            background-color: #ffffff;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.08);
+        }
+        .header {
+            background-color: #111827;
+            color: #ffffff;
+            padding: 20px 32px;
+            font-size: 18px;
+            font-weight: 600;
+        }
+        .content {
+            padding: 32px;
+            font-size: 15px;
+            line-height: 1.6;
+        }
+        .content h1 {
+            font-size: 20px;
+            margin-top: 0;
+        }
+        .footer {
+            padding: 20px 32px;
+            font-size: 12px;
+            color: #9ca3af;
+            text-align: center;
+        }
+    </style>
+    <title>"""
+
+_TEMPLATE_MID = """</title>
+</head>
+<body>
+    <div class="wrapper">
+        <div class="container">
+            <div class="header">Twiplo</div>
+            <div class="content">"""
+
+_TEMPLATE_FOOT = """</div>
+            <div class="footer">&copy; """
+
+_TEMPLATE_TAIL = """ Twiplo. All rights reserved.</div>
+        </div>
+    </div>
+</body>
+</html>"""
+
+# Year cached at import and refreshed at most once a day
+_year = datetime.now().year
+_year_checked_at = time.time()
+
+
+def _current_year() -> int:
+    """Return the current year, recomputing at most once per day."""
+    global _year, _year_checked_at
+    now = time.time()
+    if now - _year_checked_at > 86400:
+        _year = datetime.now().year
+        _year_checked_at = now
+    return _year
+
+
+def base_email_template(title: str, body: str) -> str:
+    """
+    Wrap email content in the shared HTML shell.
+
+    Args:
+        title (str): Title shown in the email client tab/preview
+        body (str): HTML content placed inside the template body
+
+    Returns:
+        str: Full HTML document for the email
+    """
+    return (
+        f"{_TEMPLATE_HEAD}{title}{_TEMPLATE_MID}{body}"
+        f"{_TEMPLATE_FOOT}{_current_year()}{_TEMPLATE_TAIL}"
+    )
@@ -3,7 +3,7 @@
 from tortoise import fields, models
 from tortoise.contrib.pydantic import pydantic_model_creator
 
-from app.config.storage import r2_storage
+from app.config.storage import get_r2
 
 
 class FileAsset(models.Model):
@@ -24,7 +24,7 @@ class FileAsset(models.Model):
         Returns:
             str: The presigned URL for accessing the file.
         """
-        return r2_storage.generate_presigned_url(self.key, expiration)
+        return get_r2().generate_presigned_url(self.key, expiration)
 
 
 FileAsset_Pydantic = pydantic_model_creator(FileAsset, name="FileAsset")
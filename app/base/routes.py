@@ -14,7 +14,7 @@ from fastapi import (
 
 from app.base.models import FileAsset
 from app.base.schemas import FileOut
-from app.config.storage import r2_storage
+from app.config.storage import get_r2
 from app.config.settings import settings
 from app.config.pagination import (
     PaginationParams,
@@ -40,21 +40,15 @@ async def upload_file(
     - Returns FileOut with a presigned preview URL (`url`).
     """
     # Upload to storage (returns the R2 key/path)
-    key = await r2_storage.upload_file(file=file, folder=folder)
+    key = await get_r2().upload_file(file=file, folder=folder)
 
-    # Compute file size (optional)
-    try:
-        content = await file.read()
-        file_size = len(content) if content is not None else None
-    finally:
-        await file.seek(0)
-
-    # Persist the file metadata
+    # Persist the file metadata; Starlette already knows the upload size,
+    # so no need to re-read the whole file into memory
     file = await FileAsset.create(
         key=key,
         alt_text=alt_text,
         content_type=file.content_type,
-        file_size=file_size,
+        file_size=file.size,
     )
 
     # Return pydantic schema with presigned URL
@@ -4,7 +4,7 @@ from typing import Optional
 
 from pydantic import BaseModel, validator
 
-from app.config.storage import r2_storage
+from app.config.storage import get_r2
 
 
 class FileOut(BaseModel):
@@ -28,7 +28,7 @@ class FileOut(BaseModel):
         key = values.get("key")
         if key:
             try:
-                return r2_storage.generate_presigned_url(key, 604800)
+                return get_r2().generate_presigned_url(key, 604800)
             except Exception:
                 return None
         return None
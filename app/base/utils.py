@@ -0,0 +1,81 @@
+"""Base utilities"""
+
+import logging
+import re
+import secrets
+
+import httpx
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Module-scope client so TLS handshakes and connections are reused across
+# sends instead of reconnecting per email
+_email_client = httpx.AsyncClient(
+    base_url="https://api.zeptomail.com",
+    timeout=10,
+    headers={
+        "Authorization": settings.ZEPTO_API_KEY,
+        "Content-Type": "application/json",
+    },
+)
+
+
+async def send_email(to_email: str, subject: str, html_body: str) -> bool:
+    """Send an email through ZeptoMail.
+
+    Args:
+        to_email (str): Recipient address
+        subject (str): Email subject line
+        html_body (str): HTML content of the email
+
+    Returns:
+        bool: True if the API accepted the email, False otherwise.
+    """
+    payload = {
+        "from": {"address": settings.EMAIL_SENDER},
+        "to": [{"email_address": {"address": to_email}}],
+        "subject": subject,
+        "htmlbody": html_body,
+    }
+    try:
+        response = await _email_client.post("/v1.1/email", json=payload)
+        response.raise_for_status()
+        return True
+    except httpx.HTTPError as e:
+        logger.error("Failed to send email to %s: %s", to_email, e)
+        return False
+
+
+def generate_otp(length: int = 6) -> str:
+    """Generate a numeric one-time password.
+
+    Args:
+        length (int): Number of digits. Defaults to 6.
+
+    Returns:
+        str: Zero-padded numeric OTP.
+    """
+    # One randbelow call + one format instead of a per-digit choice() loop
+    return str(secrets.randbelow(10 ** length)).zfill(length)
+
+
+# Compiled once at import; an ASCII translate table replaces the slower
+# Unicode-aware str.lower() for slug input
+_SLUG_RE = re.compile(rb"[^a-z0-9]+")
+_ASCII_LOWER = bytes.maketrans(
+    bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+def generate_slug(text: str) -> str:
+    """Build a URL-safe slug from arbitrary text.
+
+    Args:
+        text (str): Source text, e.g. a title or name
+
+    Returns:
+        str: Lowercase ASCII slug with hyphen separators.
+    """
+    ascii_text = text.encode("ascii", "ignore").translate(_ASCII_LOWER)
+    return _SLUG_RE.sub(b"-", ascii_text).strip(b"-").decode()
@@ -1,14 +1,26 @@
 """Pagination module for consistent pagination across endpoints"""
 
+import base64
+import hashlib
+import json
 from math import ceil
-from typing import Generic, TypeVar, List, Optional, Any
+from typing import (
+    AsyncIterator, Generic, TypeVar, List, Optional, Any, Sequence)
 
-from pydantic import BaseModel, Field, validator
+import orjson
+from cachetools import TTLCache
+from pydantic import BaseModel, Field
 from fastapi import Query
+from tortoise.expressions import Q
 from tortoise.queryset import QuerySet
 
 T = TypeVar("T")
 
+# Cache of COUNT(*) results keyed by the compiled SQL of the queryset, so
+# walking pages 2..N of the same listing skips the count round-trip. Page 1
+# always refreshes the entry.
+_count_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
 
 class PaginationParams(BaseModel):
     """Pagination parameters for requests"""
@@ -17,12 +29,10 @@ class PaginationParams(BaseModel):
     page_size: int = Field(
         default=20, ge=1, le=100, description="Number of items per page"
     )
-
-    @validator("page_size")
-    def validate_page_size(cls, v):
-        if v > 100:
-            raise ValueError("Page size cannot exceed 100")
-        return v
+    include_total: bool = Field(
+        default=True,
+        description="Whether to run the COUNT query for exact totals",
+    )
 
     @property
     def offset(self) -> int:
@@ -40,8 +50,10 @@ class PaginationMeta(BaseModel):
 
     page: int = Field(description="Current page number")
     page_size: int = Field(description="Number of items per page")
-    total_items: int = Field(description="Total number of items")
-    total_pages: int = Field(description="Total number of pages")
+    total_items: Optional[int] = Field(
+        description="Total number of items, None when totals were skipped")
+    total_pages: Optional[int] = Field(
+        description="Total number of pages, None when totals were skipped")
     has_next: bool = Field(description="Whether there is a next page")
     has_previous: bool = Field(description="Whether there is a previous page")
     next_page: Optional[int] = Field(
@@ -58,17 +70,63 @@ class PaginatedResponse(BaseModel, Generic[T]):
     meta: PaginationMeta = Field(description="Pagination metadata")
 
 
+class CursorPaginationParams(BaseModel):
+    """Cursor (keyset) pagination parameters for requests"""
+
+    cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor from the previous page"
+    )
+    page_size: int = Field(
+        default=20, ge=1, le=100, description="Number of items per page"
+    )
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Generic cursor-paginated response"""
+
+    items: List[T] = Field(description="List of items for current page")
+    next_cursor: Optional[str] = Field(
+        description="Cursor for the next page, None on the last page"
+    )
+
+
+def _encode_cursor(*values: Any) -> str:
+    """Encode order-field values into an opaque cursor string"""
+    payload = json.dumps([str(v) for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> List[str]:
+    """Decode a cursor back into its order-field values"""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
 class PaginationHelper:
     """Helper class for pagination operations"""
 
     @staticmethod
-    def create_meta(page: int, page_size: int, total_items: int) -> PaginationMeta:
+    def create_meta(
+        page: int,
+        page_size: int,
+        total_items: Optional[int],
+        has_next: Optional[bool] = None,
+    ) -> PaginationMeta:
         """Create pagination metadata"""
-        total_pages = ceil(total_items / page_size) if total_items > 0 else 0
-        has_next = page < total_pages
+        if total_items is None:
+            # Totals skipped; has_next was derived from the sentinel row
+            total_pages = None
+        else:
+            total_pages = ceil(
+                total_items / page_size) if total_items > 0 else 0
+            has_next = page < total_pages
         has_previous = page > 1
 
-        return PaginationMeta(
+        # Every field here is an already-trusted int/bool, so skip per-field
+        # validation in the hot path
+        return PaginationMeta.model_construct(
             page=page,
             page_size=page_size,
             total_items=total_items,
@@ -81,7 +139,11 @@ class PaginationHelper:
 
     @staticmethod
     async def paginate_queryset(
-        queryset: QuerySet, pagination_params: PaginationParams
+        queryset: QuerySet,
+        pagination_params: PaginationParams,
+        count_ttl: int = 300,
+        values: Optional[Sequence[str]] = None,
+        values_list: bool = False,
     ) -> tuple[List[Any], PaginationMeta]:
         """
         Paginate a Tortoise ORM queryset
@@ -89,16 +151,63 @@ class PaginationHelper:
         Args:
             queryset: The queryset to paginate
             pagination_params: Pagination parameters
+            count_ttl: Seconds the total count may be served from cache
+                for pages after the first; 0 disables caching
+            values: Column names to fetch as plain dicts via .values(),
+                skipping ORM model hydration entirely
+            values_list: Fetch the `values` columns as tuples (or flat
+                scalars for a single column) via .values_list()
 
         Returns:
-            Tuple of (items, pagination_meta)
+            Tuple of (items, pagination_meta). Items are model instances,
+            dicts or tuples depending on the values/values_list kwargs.
         """
-        # Get total count
-        total_items = await queryset.count()
+        def _project(page_query: QuerySet):
+            """Apply the dict/tuple projection, skipping model hydration"""
+            if values and values_list:
+                return page_query.values_list(
+                    *values, flat=len(values) == 1)
+            if values:
+                return page_query.values(*values)
+            return page_query
+
+        # Clients that only need has_next/has_previous can skip the COUNT
+        # entirely: over-fetch one sentinel row instead
+        if not pagination_params.include_total:
+            rows = await _project(
+                queryset.offset(pagination_params.offset).limit(
+                    pagination_params.limit + 1
+                )
+            )
+            has_next = len(rows) > pagination_params.limit
+            meta = PaginationHelper.create_meta(
+                page=pagination_params.page,
+                page_size=pagination_params.page_size,
+                total_items=None,
+                has_next=has_next,
+            )
+            return rows[: pagination_params.limit], meta
+
+        # Get total count, reusing a recent one when walking deeper pages
+        total_items = None
+        count_key = None
+        if count_ttl > 0:
+            sql = queryset.sql(params_inline=True)
+            count_key = hashlib.blake2b(
+                sql.encode(), digest_size=16).digest()
+            if pagination_params.page > 1:
+                total_items = _count_cache.get(count_key)
+
+        if total_items is None:
+            total_items = await queryset.count()
+            if count_key is not None:
+                _count_cache[count_key] = total_items
 
         # Apply pagination to queryset
-        items = await queryset.offset(pagination_params.offset).limit(
-            pagination_params.limit
+        items = await _project(
+            queryset.offset(pagination_params.offset).limit(
+                pagination_params.limit
+            )
         )
 
         # Create pagination metadata
@@ -110,12 +219,93 @@ class PaginationHelper:
 
         return items, meta
 
+    @staticmethod
+    async def paginate_cursor(
+        queryset: QuerySet,
+        params: CursorPaginationParams,
+        order_fields: tuple[str, str] = ("created_at", "id"),
+    ) -> tuple[List[Any], Optional[str]]:
+        """
+        Paginate a queryset with a keyset cursor instead of OFFSET/LIMIT.
+
+        The cursor encodes the order-field values of the last row of the
+        previous page, so the database only scans page_size rows no matter
+        how deep the client pages — and no COUNT query is needed.
+
+        Args:
+            queryset: The queryset to paginate
+            params: Cursor pagination parameters
+            order_fields: Tie-broken ordering pair, newest first
+
+        Returns:
+            Tuple of (items, next_cursor)
+        """
+        primary, tiebreak = order_fields
+
+        if params.cursor:
+            last_primary, last_tiebreak = _decode_cursor(params.cursor)
+            # The cursor stores stringified values; convert them back to the
+            # fields' Python types (datetime, UUID, ...) so the driver binds
+            # correctly typed parameters — asyncpg rejects a str for a
+            # timestamptz column
+            fields_map = queryset.model._meta.fields_map
+            last_primary = fields_map[primary].to_python_value(last_primary)
+            last_tiebreak = fields_map[tiebreak].to_python_value(last_tiebreak)
+            queryset = queryset.filter(
+                Q(**{f"{primary}__lt": last_primary})
+                | Q(**{primary: last_primary,
+                       f"{tiebreak}__lt": last_tiebreak})
+            )
+
+        # Over-fetch one row as the has-more sentinel
+        rows = await queryset.order_by(
+            f"-{primary}", f"-{tiebreak}"
+        ).limit(params.page_size + 1)
+
+        next_cursor = None
+        if len(rows) > params.page_size:
+            rows = rows[: params.page_size]
+            last = rows[-1]
+            next_cursor = _encode_cursor(
+                getattr(last, primary), getattr(last, tiebreak))
+
+        return rows, next_cursor
+
+    @staticmethod
+    async def paginate_stream(
+        queryset: QuerySet,
+        pagination_params: PaginationParams,
+        values: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield one page of rows without materializing the page as a list.
+
+        Combine with render_json_stream and a StreamingResponse for
+        endpoints where page_size * row size makes buffering the whole
+        page (once in the list, again in the JSON encoder) wasteful.
+
+        Args:
+            queryset: The queryset to paginate
+            pagination_params: Pagination parameters
+            values: Column names to stream as plain dicts via .values()
+
+        Yields:
+            Model instances, or dicts when `values` is given
+        """
+        page_query = queryset.offset(pagination_params.offset).limit(
+            pagination_params.limit
+        )
+        if values:
+            page_query = page_query.values(*values)
+        async for row in page_query:
+            yield row
+
     @staticmethod
     def create_paginated_response(
         items: List[T], meta: PaginationMeta
     ) -> PaginatedResponse[T]:
         """Create a paginated response"""
-        return PaginatedResponse(items=items, meta=meta)
+        return PaginatedResponse.model_construct(items=items, meta=meta)
 
 
 # Convenience function for common pagination workflow
@@ -125,6 +315,10 @@ async def paginate(
     """
     Convenience function to paginate a queryset and return a paginated response
 
+    Deprecated for deep pagination: OFFSET/LIMIT scans and discards
+    (page-1)*page_size rows per request. Prefer
+    PaginationHelper.paginate_cursor for large or frequently-walked tables.
+
     Args:
         queryset: The queryset to paginate
         pagination_params: Pagination parameters
@@ -136,12 +330,60 @@ async def paginate(
     return PaginationHelper.create_paginated_response(items, meta)
 
 
+async def render_json_stream(
+    meta: PaginationMeta, rows: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    """
+    Render a paginated payload as incremental JSON chunks.
+
+    Produces the same {"meta": ..., "items": [...]} shape as
+    PaginatedResponse, but encodes row by row so peak memory is one row
+    instead of the whole page. Wrap with
+    StreamingResponse(render_json_stream(meta, rows),
+    media_type="application/json") — note this bypasses response_model
+    validation, so it is opt-in per endpoint.
+
+    Args:
+        meta: Pagination metadata for the page
+        rows: Row iterator, typically PaginationHelper.paginate_stream
+
+    Yields:
+        Encoded JSON fragments
+    """
+    yield b'{"meta":' + orjson.dumps(meta.model_dump()) + b',"items":['
+    first = True
+    async for row in rows:
+        chunk = orjson.dumps(row)
+        if first:
+            first = False
+            yield chunk
+        else:
+            yield b"," + chunk
+    yield b"]}"
+
+
+# Cursor pagination parameters dependency
+def get_cursor_pagination_params(
+    cursor: Optional[str] = Query(
+        default=None, description="Opaque cursor from the previous page"),
+    page_size: int = Query(
+        default=20, ge=1, le=100, description="Number of items per page"
+    ),
+) -> CursorPaginationParams:
+    """FastAPI dependency for cursor pagination parameters"""
+    return CursorPaginationParams(cursor=cursor, page_size=page_size)
+
+
 # Common pagination parameters dependency
 def get_pagination_params(
     page: int = Query(default=1, ge=1, description="Page number (1-based)"),
     page_size: int = Query(
         default=20, ge=1, le=100, description="Number of items per page"
     ),
+    include_total: bool = Query(
+        default=True, description="Whether to compute exact totals"
+    ),
 ) -> PaginationParams:
     """FastAPI dependency for pagination parameters"""
-    return PaginationParams(page=page, page_size=page_size)
+    return PaginationParams(
+        page=page, page_size=page_size, include_total=include_total)
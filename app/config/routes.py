@@ -9,9 +9,12 @@ from app.messages import routes as messages_routes
 
 api_router = APIRouter()
 
-api_router.include_router(accounts_routes.router)
-api_router.include_router(base_routes.router)
-api_router.include_router(messages_routes.router)
+for router in (
+    accounts_routes.router,
+    base_routes.router,
+    messages_routes.router,
+):
+    api_router.include_router(router)
 
 
 @api_router.get("/health")
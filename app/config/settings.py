@@ -2,54 +2,97 @@
 Core configuration
 """
 
-import os
-from typing import Literal
+import json
+from typing import Annotated, Literal, Optional
 
-
-from dotenv import load_dotenv
-from pydantic_settings import BaseSettings
-
-
-# Load environment variables from .env file
-load_dotenv()
+from pydantic import field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from tortoise.backends.base.config_generator import expand_db_url
 
 
 class AppSettings(BaseSettings):
     """Settings Class"""
 
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
     PROJECT_NAME: str = "Twiplo"
-    DATABASE_URL: str = (
-        os.getenv("DATABASE_URL")
-    )
-    ENVIRONMENT: Literal["local", "staging", "production"] = os.getenv(
-        "ENVIRONMENT", "local"
-    )
+    DATABASE_URL: str
+    ENVIRONMENT: Literal["local", "staging", "production"] = "local"
+
+    # Email Configuration
+    EMAIL_SENDER: str = ""
+    ZEPTO_API_KEY: str = ""
 
     # R2 Storage Configuration
-    R2_ENDPOINT_URL: str = os.getenv("R2_ENDPOINT_URL")
-    R2_ACCESS_KEY_ID: str = os.getenv("R2_ACCESS_KEY_ID")
-    R2_SECRET_ACCESS_KEY: str = os.getenv("R2_SECRET_ACCESS_KEY")
-    R2_BUCKET_NAME: str = os.getenv("R2_BUCKET_NAME")
-    R2_PUBLIC_URL: str = os.getenv("R2_PUBLIC_URL")
+    R2_ENDPOINT_URL: str
+    R2_ACCESS_KEY_ID: str
+    R2_SECRET_ACCESS_KEY: str
+    R2_BUCKET_NAME: str
+    R2_PUBLIC_URL: str
 
     # Security Configuration
-    API_AUTHORIZATION_TOKEN: str = os.getenv("API_AUTHORIZATION_TOKEN")
-    CORS_ORIGINS: list[str] = os.getenv("CORS_ORIGINS", "").split(",")
-
-    TORTOISE_CONFIG: dict = {
-        "connections": {"default": DATABASE_URL},
-        "apps": {
-            "models": {
-                "models": [
-                    "aerich.models",
-                    "app.accounts.models",
-                    "app.base.models",
-                    "app.messages.models",
-                ],
-                "default_connection": "default",
+    API_AUTHORIZATION_TOKEN: str
+
+    # Argon2 password hashing parameters (OWASP recommended defaults,
+    # lightweight values in local so dev logins stay fast); None means
+    # "pick per ENVIRONMENT" below
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None
+    ARGON2_PARALLELISM: int = 1
+
+    # Seconds to cache verified JWT payloads; 0 disables the cache
+    JWT_CACHE_TTL: int = 5
+    # When set, WebSocket broadcasts fan out across workers via Redis pub/sub
+    REDIS_URL: Optional[str] = None
+    # NoDecode hands the raw env string to the validator below instead of
+    # pydantic-settings JSON-decoding it first (which would reject the
+    # comma-separated form)
+    CORS_ORIGINS: Annotated[list[str], NoDecode] = []
+
+    @field_validator("CORS_ORIGINS", mode="before")
+    @classmethod
+    def split_cors_origins(cls, v):
+        """Accept a JSON list or a comma-separated string in the env var"""
+        if isinstance(v, str):
+            v = v.strip()
+            if v.startswith("["):
+                return json.loads(v)
+            return [origin for origin in v.split(",") if origin]
+        return v
+
+    @model_validator(mode="after")
+    def default_argon2_params(self):
+        """Fill environment-dependent Argon2 defaults when unset"""
+        local = self.ENVIRONMENT == "local"
+        if self.ARGON2_TIME_COST is None:
+            self.ARGON2_TIME_COST = 1 if local else 3
+        if self.ARGON2_MEMORY_COST is None:
+            self.ARGON2_MEMORY_COST = 4096 if local else 47104
+        return self
+
+    @property
+    def TORTOISE_CONFIG(self) -> dict:
+        """Tortoise ORM configuration"""
+        connection = expand_db_url(self.DATABASE_URL)
+        if connection["engine"] == "tortoise.backends.asyncpg":
+            # The API reuses a small set of SQL shapes; a large asyncpg
+            # statement cache keeps them prepared instead of re-planned
+            # per call
+            connection["credentials"]["statement_cache_size"] = 1024
+        return {
+            "connections": {"default": connection},
+            "apps": {
+                "models": {
+                    "models": [
+                        "aerich.models",
+                        "app.accounts.models",
+                        "app.base.models",
+                        "app.messages.models",
+                    ],
+                    "default_connection": "default",
+                },
             },
-        },
-    }
+        }
 
 
 settings = AppSettings()
@@ -1,48 +1,99 @@
 """WebSocket logic for real-time chat"""
 
+import asyncio
 import json
-from typing import Dict, List
-from uuid import UUID
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+from uuid import UUID, uuid4
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
-from tortoise.exceptions import DoesNotExist
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Optional dependency, only needed for multi-worker runs
+    aioredis = None
+
+from app.config.settings import settings
 from app.messages.models import Message, Chat
 from app.accounts.models import Account
+from app.base.models import FileAsset
+
+logger = logging.getLogger(__name__)
 
 
 class ConnectionManager:
-    """Manages WebSocket connections for chat"""
+    """Manages WebSocket connections for chat.
+
+    Rooms are held per process; when settings.REDIS_URL is set, broadcasts
+    fan out through Redis pub/sub so every Uvicorn worker delivers to its
+    local sockets. Without it, delivery stays in-memory (single worker).
+    """
 
     def __init__(self):
-        # Maps message_id -> list of WebSocket connections
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Maps message_id -> set of WebSocket connections; sets make
+        # add/remove O(1) (WebSockets hash by identity) and broadcast order
+        # doesn't matter
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._redis = None
+        # Per-room subscriber tasks relaying Redis messages to local sockets
+        self._relay_tasks: Dict[str, asyncio.Task] = {}
+
+    def _redis_enabled(self) -> bool:
+        """Whether cross-worker fan-out through Redis is configured"""
+        return bool(settings.REDIS_URL and aioredis is not None)
+
+    def _get_redis(self):
+        """Lazily create the shared Redis client"""
+        if self._redis is None:
+            self._redis = aioredis.from_url(settings.REDIS_URL)
+        return self._redis
 
     async def connect(self, websocket: WebSocket, message_id: str):
         """Accept and store a WebSocket connection"""
         await websocket.accept()
 
-        if message_id not in self.active_connections:
-            self.active_connections[message_id] = []
-
-        self.active_connections[message_id].append(websocket)
-        print(
-            f"[WebSocket] User connected to message {message_id}. Active connections: {len(self.active_connections[message_id])}")
+        new_room = message_id not in self.active_connections
+        self.active_connections.setdefault(message_id, set()).add(websocket)
+        if new_room and self._redis_enabled():
+            self._relay_tasks[message_id] = asyncio.get_running_loop(
+            ).create_task(self._relay(message_id))
+        logger.debug(
+            "connected message_id=%s active=%d",
+            message_id, len(self.active_connections[message_id]))
 
     def disconnect(self, websocket: WebSocket, message_id: str):
         """Remove a WebSocket connection"""
         if message_id in self.active_connections:
-            try:
-                self.active_connections[message_id].remove(websocket)
-                print(
-                    f"[WebSocket] User disconnected from message {message_id}. Remaining: {len(self.active_connections[message_id])}")
-            except ValueError:
-                # Connection already removed
-                pass
+            self.active_connections[message_id].discard(websocket)
+            logger.debug(
+                "disconnected message_id=%s remaining=%d",
+                message_id, len(self.active_connections[message_id]))
 
             # Clean up empty message rooms
             if not self.active_connections[message_id]:
                 del self.active_connections[message_id]
+                relay = self._relay_tasks.pop(message_id, None)
+                if relay is not None:
+                    relay.cancel()
+
+    async def _relay(self, message_id: str):
+        """Deliver Redis-published payloads for a room to local sockets"""
+        pubsub = self._get_redis().pubsub()
+        channel = f"chat:{message_id}"
+        await pubsub.subscribe(channel)
+        try:
+            async for item in pubsub.listen():
+                if item["type"] == "message":
+                    await self._deliver_local(item["data"], message_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Redis relay failed for %s", channel)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
 
     async def send_personal_message(self, message: dict, websocket: WebSocket) -> bool:
         """Send a message to a specific WebSocket. Returns True if successful, False otherwise."""
@@ -50,24 +101,44 @@ class ConnectionManager:
             await websocket.send_json(message)
             return True
         except Exception as e:
-            print(f"[WebSocket] Failed to send personal message: {str(e)}")
+            logger.warning("Failed to send personal message: %s", e)
             return False
 
     async def broadcast_to_message(self, message: dict, message_id: str):
         """Broadcast a message to all connections in a message room"""
+        # Encode once for the whole room instead of letting send_json
+        # re-serialize per socket; orjson handles UUIDs and datetimes natively
+        payload = orjson.dumps(message)
+
+        if self._redis_enabled():
+            # Publish once; every worker's relay task (including ours)
+            # delivers to its local sockets
+            await self._get_redis().publish(f"chat:{message_id}", payload)
+            return
+
+        await self._deliver_local(payload, message_id)
+
+    async def _deliver_local(self, payload: bytes, message_id: str):
+        """Send an encoded payload to this worker's sockets for a room"""
         if message_id not in self.active_connections:
             return
 
-        # Create a copy of the connections list to avoid modification during iteration
-        connections = self.active_connections[message_id].copy()
-        dead_connections = []
+        # Snapshot the set to avoid modification during iteration
+        connections = list(self.active_connections[message_id])
 
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(
-                    f"[WebSocket] Failed to broadcast to connection: {str(e)}")
+        # Fire all sends concurrently so one slow client no longer stalls the
+        # rest of the room; broadcast latency drops from the sum of per-socket
+        # sends to the slowest single send
+        results = await asyncio.gather(
+            *(connection.send_bytes(payload) for connection in connections),
+            return_exceptions=True,
+        )
+
+        dead_connections = []
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Failed to broadcast to connection: %s", result)
                 # Mark connection as dead for cleanup
                 dead_connections.append(connection)
 
@@ -80,14 +151,64 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+# Coalescing chat writer: inbound frames enqueue fully-built Chat objects and
+# a background flusher persists them in bulk_create batches, so a burst of K
+# messages costs one INSERT round-trip instead of K. Broadcast happens
+# immediately from memory; durability lags by at most _FLUSH_MAX_WAIT.
+_FLUSH_MAX_BATCH = 100
+_FLUSH_MAX_WAIT = 0.02
+
+_chat_queue: asyncio.Queue = asyncio.Queue()
+_flusher_task: Optional[asyncio.Task] = None
+
+
+async def _chat_flusher():
+    """Drain the chat queue forever, persisting coalesced batches."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _chat_queue.get()]
+        deadline = loop.time() + _FLUSH_MAX_WAIT
+        while len(batch) < _FLUSH_MAX_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(_chat_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await Chat.bulk_create(batch)
+        except Exception:
+            # The batch coalesces chats from every room, so one bad row must
+            # not drop everyone else's messages: retry each chat on its own
+            # and discard only the offender
+            logger.exception(
+                "Failed to flush chat batch of %d, retrying row-by-row",
+                len(batch))
+            for chat in batch:
+                try:
+                    await chat.save(force_create=True)
+                except Exception:
+                    logger.exception(
+                        "Dropping chat %s from sender %s",
+                        chat.id, chat.sender_id)
+
+
+def _ensure_flusher():
+    """Start the flusher task lazily on the running event loop."""
+    global _flusher_task
+    if _flusher_task is None or _flusher_task.done():
+        _flusher_task = asyncio.get_running_loop().create_task(_chat_flusher())
+
+
 async def verify_user_in_message(user_id: UUID, message_id: UUID) -> bool:
     """Verify that a user is part of a message/conversation"""
-    try:
-        message = await Message.get(id=message_id).prefetch_related("participants")
-        participant_ids = [p.id for p in message.participants]
-        return user_id in participant_ids
-    except DoesNotExist:
-        return False
+    # Single EXISTS over the through table; prefetching every participant
+    # just to scan for one id materialized the whole membership list
+    return await Message.filter(
+        id=message_id, participants__id=user_id
+    ).exists()
 
 
 async def handle_chat_message(
@@ -106,31 +227,51 @@ async def handle_chat_message(
         )
         return
 
-    # Verify user is part of the conversation
-    if not await verify_user_in_message(user.id, message_id):
-        await manager.send_personal_message(
-            {"error": "Not authorized for this conversation"},
-            websocket
-        )
-        return
+    # Membership was already verified in handle_websocket_connection before
+    # the socket joined the room, so skip the per-frame DB round-trip here
+    # and trust the connection for its lifetime.
 
-    # Create chat message
-    chat = await Chat.create(
+    # Validate the file reference before enqueueing: once the chat is
+    # broadcast as delivered, a dangling file_id would only surface as a
+    # dropped row in the flusher
+    file_id = data.get("file_id")
+    if file_id is not None:
+        try:
+            file_id = int(file_id)
+            valid_file = await FileAsset.exists(id=file_id)
+        except (TypeError, ValueError):
+            valid_file = False
+        if not valid_file:
+            await manager.send_personal_message(
+                {"error": "File not found"},
+                websocket
+            )
+            return
+
+    # Build the chat in memory with its id and timestamp assigned here, hand
+    # it to the batch writer, and broadcast without waiting for the INSERT
+    chat = Chat(
+        id=uuid4(),
         message_id=message_id,
         sender_id=user.id,
         value=data["value"],
-        file_id=data.get("file_id"),
+        file_id=file_id,
     )
+    chat.created_at = datetime.now(timezone.utc)
+
+    _ensure_flusher()
+    await _chat_queue.put(chat)
 
-    # Prepare response
+    # Prepare response; UUIDs and the datetime are left as-is since orjson
+    # serializes them natively during the broadcast encode
     response = {
         "type": "chat",
-        "id": str(chat.id),
-        "message_id": str(chat.message_id),
-        "sender_id": str(chat.sender_id),
+        "id": chat.id,
+        "message_id": chat.message_id,
+        "sender_id": chat.sender_id,
         "value": chat.value,
         "file_id": chat.file_id if chat.file_id else None,
-        "created_at": chat.created_at.isoformat(),
+        "created_at": chat.created_at,
     }
 
     # Broadcast to all connections in this message room
@@ -148,13 +289,13 @@ async def handle_websocket_connection(
     try:
         message_uuid = UUID(message_id)
     except ValueError:
-        print(f"[WebSocket] Invalid message ID format: {message_id}")
+        logger.warning("Invalid message ID format: %s", message_id)
         await websocket.close(code=1008, reason="Invalid message ID")
         return
 
     if not await verify_user_in_message(user.id, message_uuid):
-        print(
-            f"[WebSocket] User {user.id} not authorized for message {message_id}")
+        logger.warning(
+            "User %s not authorized for message %s", user.id, message_id)
         await websocket.close(code=1008, reason="Not authorized")
         return
 
@@ -175,8 +316,8 @@ async def handle_websocket_connection(
         while True:
             # Receive message from WebSocket
             data = await websocket.receive_text()
-            print(
-                f"[WebSocket] Received data from user {user.id}: {data[:100]}...")
+            # Lazy %s formatting: no f-string or slicing cost when DEBUG is off
+            logger.debug("recv user=%s bytes=%d", user.id, len(data))
 
             try:
                 message_data = json.loads(data)
@@ -187,14 +328,14 @@ async def handle_websocket_connection(
                     websocket
                 )
             except json.JSONDecodeError as e:
-                print(f"[WebSocket] JSON decode error: {str(e)}")
+                logger.warning("JSON decode error: %s", e)
                 await manager.send_personal_message(
                     {"error": "Invalid JSON format"},
                     websocket
                 )
             except Exception as e:
                 # Catch any other errors from handle_chat_message
-                print(f"[WebSocket] Error handling chat message: {str(e)}")
+                logger.exception("Error handling chat message")
                 # Try to send error, but don't fail if websocket is closing
                 await manager.send_personal_message(
                     {"error": f"Failed to process message: {str(e)}"},
@@ -202,10 +343,10 @@ async def handle_websocket_connection(
                 )
 
     except WebSocketDisconnect:
-        print(
-            f"[WebSocket] User {user.id} disconnected from message {message_id}")
-    except Exception as e:
-        print(f"[WebSocket] Unexpected error in connection handler: {str(e)}")
+        logger.debug(
+            "User %s disconnected from message %s", user.id, message_id)
+    except Exception:
+        logger.exception("Unexpected error in connection handler")
     finally:
         # Always cleanup the connection
         manager.disconnect(websocket, message_id)
@@ -88,9 +88,10 @@ class Chat(models.Model):
         """Meta class for Chat model"""
         table = "chats"
         indexes = [
-            ("message_id",),
+            # Composite serves the "chats in this conversation, newest first"
+            # query as one index range scan, no sort node
+            ("message_id", "created_at"),
             ("sender_id",),
-            ("created_at",),
         ]
 
     def __str__(self):
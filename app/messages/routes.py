@@ -1,5 +1,6 @@
 """Message Routes"""
 
+import asyncio
 from typing import Optional
 from uuid import UUID
 
@@ -11,13 +12,19 @@ from fastapi import (
     Query
 )
 from fastapi.security import HTTPBearer
+from tortoise import Tortoise
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
 
 from app.accounts.models import Account
 from app.accounts.auth import get_current_user
+from app.accounts.schemas import AccountRead
+from app.messages.logic import verify_user_in_message
 from app.messages.models import Message, Chat
 from app.messages.schemas import (
     ChatRead, MessageDetail, ChatDetail, MessageWithChatDetail, ChatUpdate,
-    DirectMessageCreate, GroupMessageCreate)
+    DirectMessageCreate, GroupMessageCreate, MessageListResponse,
+    ChatListResponse)
 from app.base.models import FileAsset
 from app.config.settings import settings
 
@@ -51,39 +58,99 @@ async def create_message(
         value="Conversation started",
     )
 
-    # Reload message with relations
-    message = await Message.get(id=message.id).prefetch_related(
-        "participants", "participants__image"
-    )
+    # The participant list is already in memory — no need to reload the
+    # conversation with joins; just fetch their profile images in one query
+    image_ids = [p.image_id for p in participants if p.image_id]
+    if image_ids:
+        images = {
+            image.id: image
+            for image in await FileAsset.filter(id__in=image_ids)
+        }
+        for participant in participants:
+            if participant.image_id:
+                participant.image = images.get(participant.image_id)
 
     return MessageDetail(
         id=message.id,
         name=message.name,
-        participants=list(message.participants),
+        participants=participants,
         last_chat=ChatRead.model_validate(chat) if chat else None,
         created_at=message.created_at,
         updated_at=message.updated_at
     )
 
 
-async def find_existing_direct_message(user1_id: UUID, user2_id: UUID) -> Optional[Message]:
+# One indexed scan over the through table: both users joined in, restricted
+# to conversations with exactly two participants
+_DIRECT_MESSAGE_SQL = """
+SELECT mp1.messages_id AS id
+FROM message_participants mp1
+JOIN message_participants mp2
+    ON mp2.messages_id = mp1.messages_id
+    AND mp2.account_id = $2
+WHERE mp1.account_id = $1
+    AND (
+        SELECT COUNT(*) FROM message_participants mp
+        WHERE mp.messages_id = mp1.messages_id
+    ) = 2
+LIMIT 1
+"""
+
+# Id of the latest chat per conversation in a single pass; the window
+# function walks the (message_id, created_at DESC, id DESC) index partition
+# by partition
+_LATEST_CHAT_IDS_SQL = """
+SELECT id FROM (
+    SELECT c.id, ROW_NUMBER() OVER (
+        PARTITION BY c.message_id
+        ORDER BY c.created_at DESC, c.id DESC
+    ) AS rn
+    FROM chats c
+    WHERE c.message_id IN ({placeholders})
+) latest
+WHERE rn = 1
+"""
+
+
+def _chat_detail(chat: Chat, file: Optional[FileAsset]) -> ChatDetail:
+    """Project a chat row with its batch-fetched file spliced in.
+
+    Built field-by-field because `file` comes from one id__in query over
+    the page instead of a per-row join on a mostly-empty relation.
     """
-    Find an existing direct message conversation between two users.
+    return ChatDetail(
+        id=chat.id,
+        message_id=chat.message_id,
+        sender=chat.sender,
+        value=chat.value,
+        file=file,
+        created_at=chat.created_at,
+        updated_at=chat.updated_at,
+    )
 
-    Returns the existing message if found, None otherwise.
-    """
-    # Get all messages where user1 is a participant
-    messages = await Message.filter(
-        participants__id=user1_id
-    ).prefetch_related("participants")
 
-    # Check each message to see if it has exactly 2 participants (user1 and user2)
-    for message in messages:
-        participant_ids = {p.id for p in message.participants}
-        if len(participant_ids) == 2 and user1_id in participant_ids and user2_id in participant_ids:
-            return message
+async def _files_by_id(chats: list[Chat]) -> dict:
+    """Fetch the file assets referenced by a page of chats in one query"""
+    file_ids = {chat.file_id for chat in chats if chat.file_id}
+    if not file_ids:
+        return {}
+    return {
+        file.id: file for file in await FileAsset.filter(id__in=file_ids)
+    }
+
+
+async def find_existing_direct_message(user1_id: UUID, user2_id: UUID) -> Optional[UUID]:
+    """
+    Find an existing direct message conversation between two users.
 
-    return None
+    Returns the existing message id if found, None otherwise.
+    """
+    # The old implementation loaded every conversation the user is in, with
+    # all participants, and compared sets in Python; this is one SQL query
+    rows = await Tortoise.get_connection("default").execute_query_dict(
+        _DIRECT_MESSAGE_SQL, [str(user1_id), str(user2_id)]
+    )
+    return rows[0]["id"] if rows else None
 
 
 @router.post(
@@ -109,31 +176,29 @@ async def start_direct_message(
             detail="Cannot start a direct message with yourself"
         )
 
-    # Check if participant exists
-    participant = await Account.get_or_none(id=data.participant_id)
+    # The participant lookup and the existing-conversation check don't
+    # depend on each other, so overlap their round-trips
+    participant, existing_id = await asyncio.gather(
+        Account.get_or_none(id=data.participant_id),
+        find_existing_direct_message(current_user.id, data.participant_id),
+    )
     if not participant:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Participant not found"
         )
 
-    # Check if a direct message already exists
-    existing_message = await find_existing_direct_message(
-        current_user.id,
-        data.participant_id
-    )
-
-    if existing_message:
-        # Reload with relations and get last chat
-        existing_message = await Message.get(id=existing_message.id).prefetch_related(
-            "participants", "participants__image"
+    if existing_id:
+        # Load with relations and the last chat, again concurrently
+        existing_message, last_chat = await asyncio.gather(
+            Message.get(id=existing_id).prefetch_related(
+                "participants", "participants__image"
+            ),
+            Chat.filter(
+                message_id=existing_id
+            ).order_by("-created_at").first(),
         )
 
-        # Get last chat
-        last_chat = await Chat.filter(
-            message_id=existing_message.id
-        ).order_by("-created_at").first()
-
         return MessageDetail(
             id=existing_message.id,
             name=existing_message.name,
@@ -176,28 +241,30 @@ async def create_group_message(
     - Automatically includes the current user as a participant
     - Validates that all participant IDs exist
     """
-    # Validate that there's at least one other participant
-    if not data.participant_ids:
+    # Dedup and fold in the current user in one set; this also rejects a
+    # "group" that collapses to just the current user (e.g. their own id
+    # duplicated), which the old list-based check silently accepted
+    participant_id_set = set(data.participant_ids)
+    participant_id_set.add(current_user.id)
+    participant_id_set.discard(None)
+    if len(participant_id_set) < 2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="At least one participant is required"
         )
-
-    # Remove duplicates and ensure current user is included
-    unique_participant_ids = list(set(data.participant_ids))
-    if current_user.id not in unique_participant_ids:
-        unique_participant_ids.append(current_user.id)
-
-    # Validate that all participants exist
-    participants = []
-    for participant_id in unique_participant_ids:
-        participant = await Account.get_or_none(id=participant_id)
-        if not participant:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Participant with ID {participant_id} not found"
-            )
-        participants.append(participant)
+    unique_participant_ids = list(participant_id_set)
+
+    # Validate that all participants exist in one id__in query (WHERE
+    # id = ANY(...)) instead of one round-trip per participant
+    participants = await Account.filter(id__in=unique_participant_ids)
+    if len(participants) != len(unique_participant_ids):
+        found_ids = {p.id for p in participants}
+        missing_id = next(
+            pid for pid in unique_participant_ids if pid not in found_ids)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Participant with ID {missing_id} not found"
+        )
 
     # Validate group name
     if not data.name or not data.name.strip():
@@ -216,7 +283,7 @@ async def create_group_message(
 
 @router.get(
     "/list",
-    response_model=list[MessageDetail]
+    response_model=MessageListResponse
 )
 async def list_messages(
     page: int = Query(1, ge=1),
@@ -231,36 +298,55 @@ async def list_messages(
     """
     offset = (page - 1) * page_size
 
-    messages = await Message.filter(
-        participants__id=current_user.id
-    ).offset(offset).limit(page_size).prefetch_related(
-        "participants", "participants__image"
-    ).order_by("-updated_at")
-
-    # Get last chat for each message
-    message_ids = [msg.id for msg in messages]
-    all_chats = await Chat.filter(
-        message_id__in=message_ids
-    ).order_by("-created_at")
+    # Count and page hit different indexes, so run them concurrently
+    total, messages = await asyncio.gather(
+        Message.filter(participants__id=current_user.id).count(),
+        Message.filter(
+            participants__id=current_user.id
+        ).offset(offset).limit(page_size).prefetch_related(
+            "participants", "participants__image"
+        ).order_by("-updated_at"),
+    )
 
-    # Keep only the most recent chat for each message
+    # Resolve only the latest chat per message, instead of loading every
+    # chat those conversations ever had and deduping in Python
     last_chat_map = {}
-    for chat in all_chats:
-        if chat.message_id not in last_chat_map:
-            last_chat_map[chat.message_id] = chat
-
-    return [
-        MessageDetail(
-            id=msg.id,
-            name=msg.name,
-            participants=list(msg.participants),
-            last_chat=ChatRead.model_validate(last_chat_map.get(
-                msg.id)) if last_chat_map.get(msg.id) else None,
-            created_at=msg.created_at,
-            updated_at=msg.updated_at
+    if messages:
+        placeholders = ", ".join(
+            f"${i + 1}" for i in range(len(messages)))
+        rows = await Tortoise.get_connection("default").execute_query_dict(
+            _LATEST_CHAT_IDS_SQL.format(placeholders=placeholders),
+            [str(msg.id) for msg in messages],
         )
-        for msg in messages
-    ]
+        last_chats = await Chat.filter(id__in=[row["id"] for row in rows])
+        last_chat_map = {chat.message_id: chat for chat in last_chats}
+
+    # The same accounts (not least the current user) recur across the page's
+    # conversations; project each one through pydantic only once
+    account_cache: dict[UUID, AccountRead] = {}
+
+    def to_account(account: Account) -> AccountRead:
+        cached = account_cache.get(account.id)
+        if cached is None:
+            cached = AccountRead.model_validate(account)
+            account_cache[account.id] = cached
+        return cached
+
+    return MessageListResponse(
+        total=total,
+        items=[
+            MessageDetail(
+                id=msg.id,
+                name=msg.name,
+                participants=[to_account(p) for p in msg.participants],
+                last_chat=ChatRead.model_validate(last_chat_map.get(
+                    msg.id)) if last_chat_map.get(msg.id) else None,
+                created_at=msg.created_at,
+                updated_at=msg.updated_at
+            )
+            for msg in messages
+        ],
+    )
 
 
 @router.get(
@@ -276,46 +362,44 @@ async def get_message(
 
     - User must be a participant in the conversation
     """
-    message = await Message.get_or_none(id=message_id).prefetch_related(
-        "participants", "participants__image"
+    # The membership check is folded into the fetch filter, so one query
+    # authorizes and loads the conversation via the participant index; the
+    # last 20 chats are independent and overlap with it
+    message, chats = await asyncio.gather(
+        Message.filter(
+            id=message_id, participants__id=current_user.id
+        ).prefetch_related(
+            "participants", "participants__image"
+        ).first(),
+        Chat.filter(
+            message_id=message_id
+        ).order_by("-created_at").limit(20).select_related(
+            "sender", "sender__image"
+        ),
     )
 
     if not message:
-        raise HTTPException(
-            status_code=404,
-            detail="Message not found"
-        )
-
-    # Check authorization
-    participant_ids = [p.id for p in message.participants]
-    if current_user.id not in participant_ids:
+        # Only pay for the existence check on the error path, to tell a
+        # missing conversation apart from a non-member
+        if not await Message.exists(id=message_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Message not found"
+            )
         raise HTTPException(
             status_code=403,
             detail="Not authorized to view this message"
         )
 
-    # Get last 20 chats for this message
-    chats = await Chat.filter(
-        message_id=message_id
-    ).order_by("-created_at").limit(20).select_related(
-        "sender", "file", "sender__image", "meeting"
-    )
+    # Most chats carry no file; one id__in batch replaces a join that
+    # touched the fileassets table for every row
+    files = await _files_by_id(chats)
 
     return MessageWithChatDetail(
         id=message.id,
         participants=list(message.participants),
         last_20_chats=[
-            ChatDetail(
-                id=chat.id,
-                message_id=chat.message_id,
-                sender=chat.sender,
-                value=chat.value,
-                file=chat.file,
-                meeting_id=chat.meeting_id if chat.meeting else None,
-                created_at=chat.created_at,
-                updated_at=chat.updated_at
-            )
-            for chat in chats
+            _chat_detail(chat, files.get(chat.file_id)) for chat in chats
         ],
         created_at=message.created_at,
         updated_at=message.updated_at
@@ -324,7 +408,7 @@ async def get_message(
 
 @router.get(
     "/{message_id}/chats",
-    response_model=list[ChatDetail]
+    response_model=ChatListResponse
 )
 async def get_message_chats(
     message_id: UUID,
@@ -338,43 +422,60 @@ async def get_message_chats(
     - User must be part of the conversation
     - Paginated results
     """
-    message = await Message.get_or_none(id=message_id).prefetch_related("participants")
+    offset = (page - 1) * page_size
 
-    if not message:
-        raise HTTPException(
-            status_code=404,
-            detail="Message not found"
-        )
+    # Authorization is folded into the chats query via the participants
+    # join, so the hot path needs no separate message fetch. Count and page
+    # hit different indexes and run concurrently.
+    total, chats = await asyncio.gather(
+        Chat.filter(
+            message_id=message_id,
+            message__participants__id=current_user.id,
+        ).count(),
+        Chat.filter(
+            message_id=message_id,
+            message__participants__id=current_user.id,
+        ).offset(offset).limit(page_size).select_related(
+            "sender", "sender__image"
+        ).order_by("-created_at"),
+    )
 
-    # Check authorization
-    participant_ids = [p.id for p in message.participants]
-    if current_user.id not in participant_ids:
-        raise HTTPException(
-            status_code=403,
-            detail="Not authorized to view this message"
-        )
+    if not chats:
+        # Empty result: distinguish a genuinely empty page from a missing
+        # conversation or a non-member before returning anything
+        if not await Message.exists(id=message_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Message not found"
+            )
+        if not await Message.filter(
+            id=message_id, participants__id=current_user.id
+        ).exists():
+            raise HTTPException(
+                status_code=403,
+                detail="Not authorized to view this message"
+            )
 
-    offset = (page - 1) * page_size
+    files = await _files_by_id(chats)
+
+    return ChatListResponse(
+        total=total,
+        items=[
+            _chat_detail(chat, files.get(chat.file_id)) for chat in chats
+        ],
+    )
 
-    chats = await Chat.filter(
-        message_id=message_id
-    ).offset(offset).limit(page_size).select_related(
-        "sender", "file", "sender__image", "meeting"
-    ).order_by("-created_at")
-
-    return [
-        ChatDetail(
-            id=chat.id,
-            message_id=chat.message_id,
-            sender=chat.sender,
-            value=chat.value,
-            file=chat.file,
-            meeting_id=chat.meeting_id if chat.meeting else None,
-            created_at=chat.created_at,
-            updated_at=chat.updated_at
-        )
-        for chat in chats
-    ]
+
+# Conditional in-place edit: authorization, partial update and row
+# confirmation in one statement via RETURNING
+_EDIT_CHAT_SQL = """
+UPDATE chats
+SET value = COALESCE($1, value),
+    file_id = COALESCE($2, file_id),
+    updated_at = NOW()
+WHERE id = $3 AND sender_id = $4
+RETURNING id
+"""
 
 
 @router.patch(
@@ -392,57 +493,41 @@ async def edit_chat(
     - User must be the sender of the chat
     - Can update value, file_id
     """
-    # Get the chat with related data
-    chat = await Chat.get_or_none(id=chat_id).select_related(
-        "sender", "file", "sender__image", "meeting"
-    )
-
-    if not chat:
+    # Single conditional UPDATE: the WHERE clause carries the sender check,
+    # COALESCE keeps untouched columns, and the FK constraint validates
+    # file_id — no SELECT-before-write round-trips. execute_query_dict goes
+    # through a fetching call on every backend, so the RETURNING row is
+    # visible (asyncpg's execute_query would discard it for UPDATE)
+    try:
+        rows = await Tortoise.get_connection("default").execute_query_dict(
+            _EDIT_CHAT_SQL,
+            [data.value, data.file_id, str(chat_id), str(current_user.id)],
+        )
+    except IntegrityError:
         raise HTTPException(
             status_code=404,
-            detail="Chat not found"
+            detail="File not found"
         )
 
-    # Check authorization - only sender can edit
-    if chat.sender_id != current_user.id:
+    if not rows:
+        # Only pay for the existence check on the error path, to tell
+        # "no such chat" apart from "not the sender"
+        if not await Chat.exists(id=chat_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Chat not found"
+            )
         raise HTTPException(
             status_code=403,
             detail="Not authorized to edit this chat"
         )
 
-    # Update fields if provided
-    if data.value is not None:
-        chat.value = data.value
-
-    if data.file_id is not None:
-        # Verify file exists
-        file_asset = await FileAsset.get_or_none(id=data.file_id)
-        if file_asset:
-            chat.file = file_asset
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail="File not found"
-            )
-
-    # Save changes
-    await chat.save()
-
-    # Reload with relations for response
+    # One joined read hydrates the response relations
     chat = await Chat.get(id=chat_id).select_related(
-        "sender", "file", "sender__image", "meeting"
+        "sender", "file", "sender__image"
     )
 
-    return ChatDetail(
-        id=chat.id,
-        message_id=chat.message_id,
-        sender=chat.sender,
-        value=chat.value,
-        file=chat.file,
-        meeting_id=chat.meeting_id if chat.meeting else None,
-        created_at=chat.created_at,
-        updated_at=chat.updated_at
-    )
+    return ChatDetail.model_validate(chat)
 
 
 @router.delete(
@@ -467,27 +552,23 @@ async def delete_message(
             detail="This endpoint is only available in local environment"
         )
 
-    message = await Message.get_or_none(id=message_id).prefetch_related("participants")
-
-    if not message:
-        raise HTTPException(
-            status_code=404,
-            detail="Message not found"
-        )
-
-    # Check authorization
-    participant_ids = [p.id for p in message.participants]
-    if current_user.id not in participant_ids:
+    # One EXISTS over the through table replaces loading every participant
+    # row just to test membership
+    if not await verify_user_in_message(current_user.id, message_id):
+        if not await Message.exists(id=message_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Message not found"
+            )
         raise HTTPException(
             status_code=403,
             detail="Not authorized to delete this message"
         )
 
-    # Delete all associated chats (will cascade delete via foreign key)
-    await Chat.filter(message_id=message_id).delete()
-
-    # Delete the message
-    await message.delete()
+    # chats.message_id is ON DELETE CASCADE, so deleting the message row
+    # removes its chats in the same statement — no separate bulk delete
+    async with in_transaction():
+        await Message.filter(id=message_id).delete()
 
     return {
         "success": True,
@@ -5,25 +5,41 @@ from typing import Optional, List
 from uuid import UUID
 
 from pydantic import BaseModel
-from tortoise.contrib.pydantic import pydantic_model_creator
 
 from app.accounts.schemas import AccountRead
 from app.base.schemas import FileOut
-from app.messages.models import Message, Chat
+from app.messages.models import MessageStatus
 
 
-# Auto-generated Pydantic models from Tortoise models
-MessageRead = pydantic_model_creator(
-    Message,
-    name="MessageRead",
-    exclude_readonly=False,
-)
+# Flat read models mirroring the ORM rows. Hand-written rather than
+# pydantic_model_creator so pydantic-core compiles the validator once
+# instead of walking Tortoise field descriptors per row
+class MessageRead(BaseModel):
+    """Flat message/conversation row"""
+    id: UUID
+    status: MessageStatus
+    name: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        """Pydantic config"""
+        from_attributes = True
 
-ChatRead = pydantic_model_creator(
-    Chat,
-    name="ChatRead",
-    exclude_readonly=False,
-)
+
+class ChatRead(BaseModel):
+    """Flat chat row"""
+    id: UUID
+    message_id: UUID
+    sender_id: UUID
+    value: str
+    file_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        """Pydantic config"""
+        from_attributes = True
 
 # Message Schemas
 
@@ -89,6 +105,18 @@ class ChatDetail(BaseModel):
         from_attributes = True
 
 
+class MessageListResponse(BaseModel):
+    """Page of conversations with the total count"""
+    total: int
+    items: List[MessageDetail]
+
+
+class ChatListResponse(BaseModel):
+    """Page of chats with the total count"""
+    total: int
+    items: List[ChatDetail]
+
+
 # Custom Schemas
 class MessageWithChatDetail(BaseModel):
     """Detailed message schema with related data"""
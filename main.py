@@ -5,18 +5,21 @@ Twiplo FastAPI
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from tortoise.contrib.fastapi import register_tortoise
 
 
-from app.config.settings import AppSettings
+from app.config.settings import settings
 from app.config.routes import api_router
 from app.config.database import init_db
 
 
-settings = AppSettings()
-
-app = FastAPI(title="Twiplo API", version="1.0.0")
+app = FastAPI(
+    title="Twiplo API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -0,0 +1,15 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "chats_msg_created_idx" ON "chats" ("message_id", "created_at" DESC, "id" DESC);
+        DROP INDEX IF EXISTS "idx_chats_created_fa4464";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_chats_created_fa4464" ON "chats" ("created_at");
+        DROP INDEX IF EXISTS "chats_msg_created_idx";"""
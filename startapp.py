@@ -1,315 +1,450 @@
-#!/usr/bin/env python3
-"""
-Django-style app generator for FastAPI projects.
-Usage: python startapp.py <app_name> [--extended]
-"""
-
-import argparse
-from pathlib import Path
-
-
-# Template for services.py
-SERVICES_TEMPLATE = '''"""{} services"""
-
-from uuid import UUID
-from fastapi import HTTPException, status
-from tortoise.transactions import in_transaction
-
-from app.{}.models import *
-from app.{}.schemas import *
-
-
-async def example_service_function(resource_id: UUID) -> dict:
-    """
-    Example service function.
-
-    Args:
-        resource_id: UUID of the resource
-
-    Returns:
-        dict containing the result
-
-    Raises:
-        HTTPException: If resource is not found
-    """
-    # TODO: Implement service logic
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Service not implemented."
-    )
-'''
-
-# Template for models.py
-MODELS_TEMPLATE = '''"""{} models"""
-
-import uuid
-
-from tortoise import fields, models
-
-
-class ExampleModel(models.Model):
-    """
-    Table: {table_name}
-    """
-
-    id = fields.UUIDField(pk=True, default=uuid.uuid4)
-
-    # TODO: Add your model fields here
-    name = fields.CharField(max_length=255)
-    
-    created_at = fields.DatetimeField(auto_now_add=True)
-    updated_at = fields.DatetimeField(auto_now=True)
-
-    class Meta:
-        """Meta class for ExampleModel model"""
-        table = "{table_name}"
-        indexes = [
-            ("name",),
-        ]
-
-    def __str__(self):
-        return self.name
-'''
-
-# Template for schemas.py
-SCHEMAS_TEMPLATE = '''"""{} schemas"""
-
-from datetime import datetime
-from typing import Optional
-from uuid import UUID
-
-from tortoise.contrib.pydantic import pydantic_model_creator
-from pydantic import BaseModel, Field
-
-from app.{}.models import ExampleModel
-
-
-# Example Model Schemas
-ExampleModelFullPydantic = pydantic_model_creator(
-    ExampleModel, name="ExampleModelFull"
-)
-ExampleModelCreatePydantic = pydantic_model_creator(
-    ExampleModel,
-    name="ExampleModelCreate",
-    exclude_readonly=True,
-)
-
-
-class ExampleModelRead(BaseModel):
-    """Example model read schema."""
-    id: UUID
-    name: str
-    updated_at: datetime
-
-    class Config:
-        """Pydantic model configuration"""
-        from_attributes = True
-
-
-class ExampleModelUpdate(BaseModel):
-    """Schema for updating example model."""
-    name: Optional[str] = Field(None, min_length=1, max_length=255)
-'''
-
-# Template for routes.py
-ROUTES_TEMPLATE = '''"""{} Routes"""
-
-from uuid import UUID
-
-from fastapi import APIRouter, Depends, status, HTTPException
-
-from app.{}.services import example_service_function
-from app.{}.schemas import ExampleModelRead
-from app.accounts.models import Account
-from app.accounts.auth import get_current_user
-
-
-router = APIRouter(prefix="/{}", tags=["{}"])
-
-
-@router.get("/{{resource_id}}", response_model=ExampleModelRead, status_code=status.HTTP_200_OK)
-async def get_resource(resource_id: UUID):
-    """
-    Get resource by ID.
-
-    Args:
-        resource_id: UUID of the resource
-
-    Returns:
-        Resource details
-    """
-    # TODO: Implement endpoint logic
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Endpoint not implemented."
-    )
-'''
-
-# Template for emails.py
-EMAILS_TEMPLATE = '''"""{} Email Templates"""
-
-from typing import Dict
-
-from app.base.email_template import base_email_template as base_template
-
-
-def example_email(context: Dict) -> str:
-    """
-    Generate HTML email template for example email
-
-    Args:
-        context (dict): Contains template variables
-
-    Returns:
-        str: HTML formatted email content
-    """
-    content = f"""
-        <h1>Example Email</h1>
-        <p>Hello {{context.get('name', 'User')}},</p>
-        <p>This is an example email template.</p>
-        <p>Please customize this template to fit your needs.</p>
-        """
-    return base_template("Example Email", content)
-'''
-
-# Template for utils.py
-UTILS_TEMPLATE = '''"""{} utilities"""
-
-from uuid import UUID
-
-from fastapi import HTTPException, status
-
-from app.accounts.models import Account
-from app.{}.models import ExampleModel
-
-
-def example_utility_function(resource_id: UUID) -> ExampleModel:
-    """
-    Example utility function.
-
-    Args:
-        resource_id: UUID of the resource
-
-    Returns:
-        ExampleModel instance
-
-    Raises:
-        HTTPException: If resource is not found
-    """
-    # TODO: Implement utility logic
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Utility not implemented."
-    )
-'''
-
-# Template for enums.py
-ENUMS_TEMPLATE = '''"""{} enums"""
-
-from enum import Enum
-
-
-class ExampleEnum(str, Enum):
-    """Example enum"""
-    OPTION_ONE = "option_one"
-    OPTION_TWO = "option_two"
-'''
-
-# Template for __init__.py (optional, but good practice)
-INIT_TEMPLATE = '''"""{} module"""
-'''
-
-
-def generate_app(app_name: str, extended: bool = False):
-    """
-    Generate a new FastAPI app with boilerplate files.
-
-    Args:
-        app_name: Name of the app to create (lowercase, underscore-separated)
-        extended: If True, also generate routes.py, emails.py, utils.py, enums.py
-    """
-    # Validate app name
-    if not app_name.islower() or not app_name.replace('_', '').isalnum():
-        print(
-            f"Error: App name '{app_name}' must be lowercase and contain only letters, numbers, and underscores.")
-        return
-
-    # Get the app directory path
-    base_dir = Path(__file__).parent
-    app_dir = base_dir / "app" / app_name
-
-    # Check if app already exists
-    if app_dir.exists():
-        print(f"Error: App '{app_name}' already exists at {app_dir}")
-        return
-
-    # Create app directory
-    app_dir.mkdir(parents=True, exist_ok=False)
-    print(f"Created directory: {app_dir}")
-
-    # Generate module name for templates (capitalize first letter of each word)
-    module_name = ' '.join(word.capitalize() for word in app_name.split('_'))
-    table_name = app_name  # Use app_name as table name (can be customized)
-
-    # Generate required files
-    files_to_create = [
-        ("services.py", SERVICES_TEMPLATE.format(module_name, app_name, app_name)),
-        ("models.py", MODELS_TEMPLATE.format(module_name, table_name=table_name)),
-        ("schemas.py", SCHEMAS_TEMPLATE.format(module_name, app_name)),
-    ]
-
-    # Add extended files if flag is set
-    if extended:
-        routes_prefix = app_name.replace('_', '-')
-        routes_tag = module_name
-        files_to_create.extend([
-            ("routes.py", ROUTES_TEMPLATE.format(module_name,
-             app_name, app_name, routes_prefix, routes_tag)),
-            ("emails.py", EMAILS_TEMPLATE.format(module_name)),
-            ("utils.py", UTILS_TEMPLATE.format(module_name, app_name)),
-            ("enums.py", ENUMS_TEMPLATE.format(module_name)),
-        ])
-
-    # Write files
-    for filename, content in files_to_create:
-        file_path = app_dir / filename
-        file_path.write_text(content, encoding='utf-8')
-        print(f"Created file: {file_path}")
-
-    print(f"\nSuccessfully created app '{app_name}'")
-    if extended:
-        print(
-            f"  Created {len(files_to_create)} files (including extended files)")
-    else:
-        print(f"  Created {len(files_to_create)} files (required files only)")
-        print(f"  Run with --extended flag to also create routes.py, emails.py, utils.py, enums.py")
-
-
-def main():
-    """Main entry point for the script."""
-    parser = argparse.ArgumentParser(
-        description="Generate a new FastAPI app with boilerplate files",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python startapp.py my_app
-  python startapp.py my_app --extended
-  python startapp.py user_profiles -e
-        """
-    )
-    parser.add_argument(
-        "app_name",
-        help="Name of the app to create (lowercase, underscore-separated)"
-    )
-    parser.add_argument(
-        "-e", "--extended",
-        action="store_true",
-        help="Also generate routes.py, emails.py, utils.py, and enums.py"
-    )
-
-    args = parser.parse_args()
-    generate_app(args.app_name, args.extended)
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Django-style app generator for FastAPI projects.
+Usage: python startapp.py <app_name> [--extended]
+"""
+
+import sys
+
+# Hand-written copy of the argparse rendering, so help/typo invocations
+# never pay for building the parser
+_STATIC_HELP = """\
+usage: startapp.py [-h] [-e] [--dry-run] app_name
+
+Generate a new FastAPI app with boilerplate files
+
+positional arguments:
+  app_name        Name of the app to create (lowercase, underscore-separated)
+
+options:
+  -h, --help      show this help message and exit
+  -e, --extended  Also generate routes.py, emails.py, utils.py, and enums.py
+  --dry-run       Validate and render templates without writing anything
+
+Examples:
+  python startapp.py my_app
+  python startapp.py my_app --extended
+  python startapp.py user_profiles -e
+"""
+
+# Fast path: answer help (or a bare invocation) before importing anything
+# heavier than sys
+if __name__ == "__main__" and (
+    len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help")
+):
+    sys.stdout.write(_STATIC_HELP)
+    sys.exit(0)
+
+import os
+import re
+
+# Valid app names: lowercase letters, digits and underscores, starting
+# with a letter. One compiled C-level pass replaces the islower/replace/
+# isalnum walk
+_APP_NAME_RE = re.compile(r'[a-z][a-z0-9_]*')
+
+# Project root, resolved once at import. When running from the
+# startapp.pyz archive, __file__ sits inside the zip, so step out to the
+# directory containing it
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if not os.path.isdir(_BASE_DIR):
+    _BASE_DIR = os.path.dirname(_BASE_DIR)
+
+
+# Template for services.py
+SERVICES_TEMPLATE = '''"""$module services"""
+
+from uuid import UUID
+from fastapi import HTTPException, status
+from tortoise.transactions import in_transaction
+
+from app.$app.models import *
+from app.$app.schemas import *
+
+
+async def example_service_function(resource_id: UUID) -> dict:
+    """
+    Example service function.
+
+    Args:
+        resource_id: UUID of the resource
+
+    Returns:
+        dict containing the result
+
+    Raises:
+        HTTPException: If resource is not found
+    """
+    # TODO: Implement service logic
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail="Service not implemented."
+    )
+'''
+
+# Template for models.py
+MODELS_TEMPLATE = '''"""$module models"""
+
+import uuid
+
+from tortoise import fields, models
+
+
+class ExampleModel(models.Model):
+    """
+    Table: $table
+    """
+
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+
+    # TODO: Add your model fields here
+    name = fields.CharField(max_length=255)
+    
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        """Meta class for ExampleModel model"""
+        table = "$table"
+        indexes = [
+            ("name",),
+        ]
+
+    def __str__(self):
+        return self.name
+'''
+
+# Template for schemas.py
+SCHEMAS_TEMPLATE = '''"""$module schemas"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from tortoise.contrib.pydantic import pydantic_model_creator
+from pydantic import BaseModel, Field
+
+from app.$app.models import ExampleModel
+
+
+# Example Model Schemas
+ExampleModelFullPydantic = pydantic_model_creator(
+    ExampleModel, name="ExampleModelFull"
+)
+ExampleModelCreatePydantic = pydantic_model_creator(
+    ExampleModel,
+    name="ExampleModelCreate",
+    exclude_readonly=True,
+)
+
+
+class ExampleModelRead(BaseModel):
+    """Example model read schema."""
+    id: UUID
+    name: str
+    updated_at: datetime
+
+    class Config:
+        """Pydantic model configuration"""
+        from_attributes = True
+
+
+class ExampleModelUpdate(BaseModel):
+    """Schema for updating example model."""
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+'''
+
+# Template for routes.py
+ROUTES_TEMPLATE = '''"""$module Routes"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, status, HTTPException
+
+from app.$app.services import example_service_function
+from app.$app.schemas import ExampleModelRead
+from app.accounts.models import Account
+from app.accounts.auth import get_current_user
+
+
+router = APIRouter(prefix="/$prefix", tags=["$tag"])
+
+
+@router.get("/{resource_id}", response_model=ExampleModelRead, status_code=status.HTTP_200_OK)
+async def get_resource(resource_id: UUID):
+    """
+    Get resource by ID.
+
+    Args:
+        resource_id: UUID of the resource
+
+    Returns:
+        Resource details
+    """
+    # TODO: Implement endpoint logic
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail="Endpoint not implemented."
+    )
+'''
+
+# Template for emails.py; the single $module hole is spliced at generation
+# time, so braces here are literal (no str.format escaping)
+EMAILS_TEMPLATE = '''"""$module Email Templates"""
+
+from typing import Dict
+
+from app.base.email_template import base_email_template as base_template
+
+
+def example_email(context: Dict) -> str:
+    """
+    Generate HTML email template for example email
+
+    Args:
+        context (dict): Contains template variables
+
+    Returns:
+        str: HTML formatted email content
+    """
+    content = f"""
+        <h1>Example Email</h1>
+        <p>Hello {context.get('name', 'User')},</p>
+        <p>This is an example email template.</p>
+        <p>Please customize this template to fit your needs.</p>
+        """
+    return base_template("Example Email", content)
+'''
+
+# Template for utils.py
+UTILS_TEMPLATE = '''"""$module utilities"""
+
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.accounts.models import Account
+from app.$app.models import ExampleModel
+
+
+def example_utility_function(resource_id: UUID) -> ExampleModel:
+    """
+    Example utility function.
+
+    Args:
+        resource_id: UUID of the resource
+
+    Returns:
+        ExampleModel instance
+
+    Raises:
+        HTTPException: If resource is not found
+    """
+    # TODO: Implement utility logic
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail="Utility not implemented."
+    )
+'''
+
+# Template for enums.py
+ENUMS_TEMPLATE = '''"""$module enums"""
+
+from enum import Enum
+
+
+class ExampleEnum(str, Enum):
+    """Example enum"""
+    OPTION_ONE = "option_one"
+    OPTION_TWO = "option_two"
+'''
+
+# Template for __init__.py (optional, but good practice)
+INIT_TEMPLATE = '''"""{} module"""
+'''
+
+def _compile_template(src: str) -> list:
+    """
+    Compile a template into alternating UTF-8 slices and hole names.
+
+    The constant boilerplate is split and encoded once at import;
+    generation just splices encoded hole values between the slices, with
+    no substitution parser or re-encoding in the path.
+    """
+    parts = re.split(r'\$([a-z]+)', src)
+    # Even indexes are literal text, odd indexes are hole names
+    return [
+        part.encode('utf-8') if i % 2 == 0 else part
+        for i, part in enumerate(parts)
+    ]
+
+
+_TEMPLATE_SEGMENTS = {
+    'services.py': _compile_template(SERVICES_TEMPLATE),
+    'models.py': _compile_template(MODELS_TEMPLATE),
+    'schemas.py': _compile_template(SCHEMAS_TEMPLATE),
+    'routes.py': _compile_template(ROUTES_TEMPLATE),
+    'emails.py': _compile_template(EMAILS_TEMPLATE),
+    'utils.py': _compile_template(UTILS_TEMPLATE),
+    'enums.py': _compile_template(ENUMS_TEMPLATE),
+}
+
+_EXTENDED_FILES = frozenset(
+    ('routes.py', 'emails.py', 'utils.py', 'enums.py'))
+
+
+def _write_one(app_dir: str, filename: str, segments: list) -> str:
+    """Write one file's rendered segments in a single syscall"""
+    file_path = os.path.join(app_dir, filename)
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if len(segments) == 1:
+            # Hole-free template: the payload is already one blob
+            os.write(fd, segments[0])
+        elif len(segments) == 3:
+            # Single hole: one small concat beats writev's vector setup
+            os.write(fd, b''.join(segments))
+        else:
+            os.writev(fd, segments)
+    finally:
+        os.close(fd)
+    return file_path
+
+
+def _iter_files(subs: dict, extended: bool):
+    """
+    Yield (filename, write segments) pairs for the files to generate.
+
+    Segments are the template's pre-encoded slices with the encoded hole
+    values spliced in, ready for writev — no substitution parser, no
+    re-encoding and no joined payload allocation. A generator keeps the
+    single-pass write loop from materializing anything as a list first.
+    """
+    subs_b = {name: value.encode('utf-8') for name, value in subs.items()}
+    for filename, compiled in _TEMPLATE_SEGMENTS.items():
+        if not extended and filename in _EXTENDED_FILES:
+            continue
+        yield filename, [
+            segment if type(segment) is bytes else subs_b[segment]
+            for segment in compiled
+        ]
+
+
+def generate_app(app_name: str, extended: bool = False,
+                 dry_run: bool = False):
+    """
+    Generate a new FastAPI app with boilerplate files.
+
+    Args:
+        app_name: Name of the app to create (lowercase, underscore-separated)
+        extended: If True, also generate routes.py, emails.py, utils.py, enums.py
+        dry_run: If True, validate and render everything but touch nothing
+    """
+    # Validate app name
+    if not _APP_NAME_RE.fullmatch(app_name):
+        print(
+            f"Error: App name '{app_name}' must be lowercase and contain only letters, numbers, and underscores.")
+        return
+
+    # Get the app directory path; plain os.path calls avoid pulling in
+    # pathlib and allocating Path objects for a handful of operations
+    app_dir = os.path.join(_BASE_DIR, "app", app_name)
+
+    # Check if app already exists
+    if os.path.exists(app_dir):
+        print(f"Error: App '{app_name}' already exists at {app_dir}")
+        return
+
+    # Generate module name for templates (capitalize first letter of each
+    # word); replace + title is a single C-level pass, no split/join
+    module_name = app_name.replace('_', ' ').title()
+
+    # Every hole value, computed once and shared by all templates
+    subs = {
+        'module': module_name,
+        'app': app_name,
+        'table': app_name,  # Use app_name as table name (can be customized)
+        'prefix': app_name.replace('_', '-'),
+        'tag': module_name,
+    }
+
+    # Dry run: render every template (so hole/template bugs still surface)
+    # but skip all filesystem work
+    if dry_run:
+        names = [filename for filename, _ in _iter_files(subs, extended)]
+        sys.stdout.write(''.join(
+            [f"Dry run: would create directory {app_dir}\n"]
+            + [f"Dry run: would create file: "
+               f"{os.path.join(app_dir, name)}\n" for name in names]
+        ))
+        return
+
+    # Create app directory
+    os.makedirs(app_dir)
+
+    # Coalesce progress output into one stdout write at the end instead of
+    # a flush-per-line print for every file
+    msgs = [f"Created directory: {app_dir}\n"]
+
+    # Write files: one os.write per file skips the TextIOWrapper and its
+    # Python-level buffering — each payload is already a single chunk
+    if extended:
+        # Seven independent inodes: overlap the writes in a small thread
+        # pool; the GIL is released for the duration of each os.write
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(
+                lambda item: _write_one(app_dir, *item),
+                _iter_files(subs, extended)))
+    else:
+        paths = [
+            _write_one(app_dir, filename, content)
+            for filename, content in _iter_files(subs, extended)
+        ]
+    msgs.extend(f"Created file: {path}\n" for path in paths)
+    count = len(paths)
+
+    msgs.append(f"\nSuccessfully created app '{app_name}'\n")
+    if extended:
+        msgs.append(
+            f"  Created {count} files (including extended files)\n")
+    else:
+        msgs.append(f"  Created {count} files (required files only)\n")
+        msgs.append(
+            "  Run with --extended flag to also create routes.py, "
+            "emails.py, utils.py, enums.py\n")
+    sys.stdout.write(''.join(msgs))
+
+
+_USAGE = "usage: startapp.py [-h] [-e] [--dry-run] app_name\n"
+
+
+def main():
+    """Main entry point for the script."""
+    # A positional and two boolean flags don't justify argparse's import
+    # and parser-construction cost; parse sys.argv by hand
+    args = sys.argv[1:]
+    if not args or "-h" in args or "--help" in args:
+        sys.stdout.write(_STATIC_HELP)
+        return
+
+    extended = False
+    for flag in ("-e", "--extended"):
+        if flag in args:
+            args.remove(flag)
+            extended = True
+
+    dry_run = "--dry-run" in args
+    if dry_run:
+        args.remove("--dry-run")
+
+    if len(args) != 1 or args[0].startswith("-"):
+        sys.stderr.write(_USAGE)
+        sys.exit(2)
+
+    generate_app(args[0], extended, dry_run)
+
+
+if __name__ == "__main__":
+    main()